@@ -0,0 +1,684 @@
+"""
+PulseDownloader benchmark harness.
+
+Runs the downloader CLI against a bundled local HTTP server and reports
+throughput, time-to-first-byte, CPU time and peak RSS per scenario as JSON.
+Everything runs offline; only the Python standard library is used.
+
+Usage:
+    python benchmarks/pulse_bench.py                       # all scenarios
+    python benchmarks/pulse_bench.py -s single-large --json results.json
+    python benchmarks/pulse_bench.py --no-ranges --latency 0.05 --bandwidth 8M
+    python benchmarks/pulse_bench.py --serve               # server only
+
+The command that is benchmarked can be changed with --cmd. It is a template
+where {url} and {out} are replaced with the download URL and a fresh output
+directory, e.g. --cmd "curl -s -o {out}/file.bin {url}". Without --cmd the
+bundled Pulse_Downloader.py is run, which needs the Windows-only PyArmor
+runtime; on Linux pass --cmd to benchmark another client.
+
+Time-to-first-byte runs from process launch to the first body byte the server
+sends for that run, so interpreter and import startup are included. CPU time
+and peak RSS belong to the client process itself: wait4 and /proc VmHWM
+(sampled while it runs) on Linux, GetProcessTimes and PeakWorkingSetSize on
+Windows. Metrics a platform cannot provide are listed under "unsupported".
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import select
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOWNLOADER = os.path.join(REPO_ROOT, "Pulse-Downloader-Windows", "Pulse_Downloader.py")
+RUN_IDS = itertools.count()
+
+WRITE_CHUNK = 64 * 1024
+STDERR_TAIL = 4096
+PATTERN_SIZE = 1024 * 1024
+PATTERN = random.Random(0).randbytes(PATTERN_SIZE)
+
+# Platform-style URLs routed to yt-dlp; they only ever reach the local proxy.
+PLATFORM_URLS = (
+    "https://www.youtube.com/watch?v=bench{i:06d}",
+    "https://youtu.be/bench{i:06d}",
+    "https://vimeo.com/{i}",
+    "https://soundcloud.com/pulse-bench/track-{i}",
+    "http://www.dailymotion.com/video/x{i:06d}",
+)
+
+SCENARIOS = ("single-large", "many-small", "resume-after-abort", "detection-heavy")
+
+
+def parse_size(value):
+    """Parse sizes such as 512, 64K, 8M or 1G into a number of bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    factor = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[unit.upper()]
+    return int(float(number) * factor)
+
+
+def payload(offset, length):
+    """Return deterministic file content for the given byte range."""
+    out = bytearray()
+    while length > 0:
+        start = offset % PATTERN_SIZE
+        piece = PATTERN[start:start + length]
+        out += piece
+        offset += len(piece)
+        length -= len(piece)
+    return bytes(out)
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in server
+# ---------------------------------------------------------------------------
+
+class BenchServer(ThreadingHTTPServer):
+    """HTTP server serving synthetic files of any size at /files/<name>?size=N."""
+
+    daemon_threads = True
+
+    def __init__(self, address, ranges=True, latency=0.0, bandwidth=0):
+        super().__init__(address, BenchHandler)
+        self.ranges = ranges
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.lock = threading.Lock()
+        self.stalls = {}
+        self.stalled = threading.Event()
+        self.reset_stats()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.range_requests = 0
+            self.proxy_requests = 0
+            self.bytes_sent = 0
+            self.first_byte_times = {}
+            self.active_runs = set()
+
+    def expect_run(self, run):
+        """Count traffic for run in the current stats; other runs are stale."""
+        with self.lock:
+            self.active_runs.add(run)
+
+    def stall_after(self, path, nbytes):
+        """Stop sending the body of the next GET for path after nbytes."""
+        with self.lock:
+            self.stalls[path] = nbytes
+        self.stalled.clear()
+
+    def clear_stall(self, path):
+        with self.lock:
+            self.stalls.pop(path, None)
+
+    def record(self, sent=0, first_byte=None, ranged=False, run=None):
+        with self.lock:
+            if run not in self.active_runs:
+                # A handler left over from an earlier scenario's client.
+                return
+            self.bytes_sent += sent
+            if first_byte is not None:
+                self.requests += 1
+                self.range_requests += int(ranged)
+                self.first_byte_times.setdefault(run, first_byte)
+
+    def record_proxy(self):
+        with self.lock:
+            self.proxy_requests += 1
+
+
+class BenchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _resolve(self):
+        parsed = urlparse(self.path)
+        if parsed.netloc:
+            # Absolute URI: a platform request sent here through the proxy env.
+            self.server.record_proxy()
+            self.send_error(502, "Offline benchmark proxy")
+            return None
+        if not parsed.path.startswith("/files/"):
+            self.send_error(404)
+            return None
+        query = parse_qs(parsed.query)
+        try:
+            size = int(query.get("size", ["0"])[0])
+        except ValueError:
+            self.send_error(400)
+            return None
+        return parsed.path, size, query.get("run", [None])[0]
+
+    def _range(self, size):
+        header = self.headers.get("Range")
+        if not header or not self.server.ranges:
+            return None
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+        if not match or match.group(1) == "" and match.group(2) == "":
+            return None
+        first, last = match.groups()
+        if first == "":
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return "unsatisfiable"
+        return start, end
+
+    def _headers(self):
+        resolved = self._resolve()
+        if resolved is None:
+            return None
+        path, size, run = resolved
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        byte_range = self._range(size)
+        if byte_range == "unsatisfiable":
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        if byte_range:
+            start, end = byte_range
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            start, end = 0, size - 1
+            self.send_response(200)
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", f'"{size:x}"')
+        self.end_headers()
+        return path, start, end, bool(byte_range), run
+
+    def do_HEAD(self):
+        self._headers()
+
+    def do_CONNECT(self):
+        self.server.record_proxy()
+        self.send_error(502, "Offline benchmark proxy")
+        self.close_connection = True
+
+    def do_GET(self):
+        result = self._headers()
+        if result is None:
+            return
+        path, start, end, ranged, run = result
+        server = self.server
+        with server.lock:
+            stall_at = server.stalls.pop(path, None)
+        bandwidth = server.bandwidth
+        began = time.perf_counter()
+        offset, sent = start, 0
+        try:
+            while offset <= end:
+                length = min(WRITE_CHUNK, end - offset + 1)
+                if stall_at is not None and sent + length > stall_at:
+                    length = stall_at - sent
+                if length > 0:
+                    self.wfile.write(payload(offset, length))
+                    server.record(length, time.time() if sent == 0 else None, ranged, run)
+                    offset += length
+                    sent += length
+                if stall_at is not None and sent >= stall_at:
+                    self.wfile.flush()
+                    server.stalled.set()
+                    self._hold_until_closed()
+                    return
+                if bandwidth:
+                    ahead = sent / bandwidth - (time.perf_counter() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _hold_until_closed(self):
+        """Keep a stalled connection open until the client goes away."""
+        self.close_connection = True
+        while True:
+            try:
+                readable, _, _ = select.select([self.connection], [], [], 0.1)
+                # Drain anything the client sends; an empty read means it closed.
+                if readable and not self.connection.recv(65536):
+                    return
+            except OSError:
+                return
+
+
+def start_server(host="127.0.0.1", port=0, **options):
+    server = BenchServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Client runner
+# ---------------------------------------------------------------------------
+
+def build_command(template, url, out):
+    """Return the client argv; template is the --cmd string or None for the default."""
+    if template is None:
+        return [sys.executable, DOWNLOADER, "--no-gui", url, "-o", out, "--no-prompt"]
+    posix = os.name != "nt"
+    parts = shlex.split(template, posix=posix)
+    if not posix:
+        # Non-POSIX shlex keeps the quotes; Popen would quote them again.
+        parts = [part[1:-1] if len(part) > 1 and part[0] == part[-1] == '"' else part
+                 for part in parts]
+    return [part.format(url=url, out=out) for part in parts]
+
+
+if os.name == "nt":
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    class _MemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE,) + (ctypes.POINTER(wintypes.FILETIME),) * 4
+    _kernel32.K32GetProcessMemoryInfo.argtypes = (
+        wintypes.HANDLE, ctypes.POINTER(_MemoryCounters), wintypes.DWORD)
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+
+def open_process(pid):
+    """Open a Windows handle that keeps the client's stats readable after exit."""
+    if os.name != "nt":
+        return None
+    return _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid) or None
+
+
+def process_usage(handle):
+    """Return (cpu_seconds, peak_working_set_bytes) for a Windows process handle."""
+    if handle is None:
+        return None, None
+    try:
+        times = [wintypes.FILETIME() for _ in range(4)]
+        cpu = None
+        if _kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+            # Kernel and user time, in 100 ns units.
+            cpu = sum((t.dwHighDateTime << 32 | t.dwLowDateTime) for t in times[2:]) / 1e7
+        counters = _MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        rss = None
+        if _kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            rss = counters.PeakWorkingSetSize
+        return cpu, rss
+    finally:
+        _kernel32.CloseHandle(handle)
+
+
+def unsupported_metrics():
+    """Name the per-process metrics this platform cannot measure."""
+    if os.name == "nt":
+        return []
+    missing = []
+    if not hasattr(os, "wait4"):
+        missing.append("cpu_seconds")
+    if not os.path.exists(f"/proc/{os.getpid()}/status"):
+        missing.append("peak_rss_bytes")
+    return missing
+
+
+def peak_rss(pid):
+    """Return the VmHWM of a running process in bytes, or None if unavailable.
+
+    VmHWM is reset on exec, so unlike ru_maxrss from wait4 it does not include
+    memory inherited from the harness.
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_tail(stream, tail, limit=STDERR_TAIL):
+    """Drain stream, keeping only its last limit bytes in tail."""
+    for chunk in iter(lambda: stream.read1(65536), b""):
+        tail += chunk
+        del tail[:-limit]
+
+
+def run_client(template, url, out, timeout, abort_event=None, env=None):
+    """Run one downloader process and return wall time, CPU time and peak RSS.
+
+    If abort_event is given, the client is killed as soon as it is set. The
+    child is reaped only here (wait4 or Popen.poll), never twice.
+    """
+    cmd = build_command(template, url, out)
+    started = time.time()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            env=dict(os.environ, **env) if env else None)
+    handle = open_process(proc.pid)
+    tail = bytearray()
+    stderr_reader = threading.Thread(target=read_tail, args=(proc.stderr, tail), daemon=True)
+    stderr_reader.start()
+    deadline = started + timeout
+    aborted = timed_out = killed = False
+    cpu = rss = None
+    while True:
+        if hasattr(os, "wait4"):
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                cpu = usage.ru_utime + usage.ru_stime
+                break
+        elif proc.poll() is not None:
+            break
+        sample = peak_rss(proc.pid)
+        if sample is not None:
+            rss = max(rss or 0, sample)
+        if not killed:
+            if abort_event is not None and abort_event.is_set():
+                aborted = killed = True
+            elif time.time() > deadline:
+                timed_out = killed = True
+            if killed and hasattr(os, "wait4"):
+                # Still unreaped at this point, so the pid cannot have been reused.
+                os.kill(proc.pid, signal.SIGKILL)
+            elif killed:
+                proc.kill()
+        time.sleep(0.005)
+    if handle is not None:
+        cpu, rss = process_usage(handle)
+    stderr_reader.join(1)
+    return {
+        "started": started,
+        "wall": time.time() - started,
+        "cpu": cpu,
+        "rss": rss,
+        "returncode": proc.returncode,
+        "aborted": aborted,
+        "timed_out": timed_out,
+        "stderr_tail": tail.decode("utf-8", "replace"),
+        "cmd": cmd,
+    }
+
+
+def bytes_on_disk(folder):
+    total = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class Scenario:
+    """Accumulates client runs for one scenario and renders the result."""
+
+    def __init__(self, name, server, args):
+        self.name = name
+        self.server = server
+        self.args = args
+        self.runs = []
+        self.expected = 0
+        self.workdir = tempfile.mkdtemp(prefix=f"pulse-bench-{name}-")
+        server.reset_stats()
+
+    def url(self, name, size, query=""):
+        return f"{self.server.base_url}/files/{name}?size={size}{query}"
+
+    def download(self, url, size, out=None, abort_event=None, category="direct", env=None):
+        """Run the client once; the URL is tagged with a run id for TTFB matching."""
+        out = out or tempfile.mkdtemp(dir=self.workdir)
+        run_id = str(next(RUN_IDS))
+        self.server.expect_run(run_id)
+        if url.startswith(self.server.base_url):
+            url += f"&run={run_id}"
+        run = run_client(self.args.cmd, url, out, self.args.timeout, abort_event, env)
+        run.update(id=run_id, category=category)
+        if abort_event is None and category == "direct":
+            self.expected += size
+        self.runs.append(run)
+        return out
+
+    def result(self, wall, **extra):
+        server = self.server
+        # Measured from process launch, so interpreter and import startup are included.
+        ttfb = [server.first_byte_times[run["id"]] - run["started"]
+                for run in self.runs if run["id"] in server.first_byte_times]
+        on_disk = bytes_on_disk(self.workdir)
+        cpu = [run["cpu"] for run in self.runs if run["cpu"] is not None]
+        rss = [run["rss"] for run in self.runs if run["rss"] is not None]
+        # Platform URLs cannot succeed offline; only a timeout counts as a failure there.
+        failed = [run for run in self.runs
+                  if run["timed_out"] or run["category"] == "direct"
+                  and run["returncode"] != 0 and not run["aborted"]]
+        result = {
+            "scenario": self.name,
+            "processes": len(self.runs),
+            "failed": len(failed),
+            "wall_seconds": round(wall, 4),
+            "bytes_expected": self.expected,
+            "bytes_on_disk": on_disk,
+            "bytes_served": server.bytes_sent,
+            "verified": on_disk == self.expected and not failed,
+            "mb_per_s": round(on_disk / wall / 1e6, 3) if wall > 0 else None,
+            "ttfb_seconds": {
+                "first": round(ttfb[0], 4) if ttfb else None,
+                "mean": round(sum(ttfb) / len(ttfb), 4) if ttfb else None,
+                "max": round(max(ttfb), 4) if ttfb else None,
+            },
+            "cpu_seconds": round(sum(cpu), 4) if cpu else None,
+            "peak_rss_bytes": max(rss) if rss else None,
+            # Linux samples VmHWM, so clients that exit within one poll have none.
+            "peak_rss_runs": len(rss),
+            "get_requests": server.requests,
+            "range_requests": server.range_requests,
+        }
+        categories = sorted({run["category"] for run in self.runs})
+        if len(categories) > 1:
+            result["categories"] = {}
+            for category in categories:
+                runs = [run for run in self.runs if run["category"] == category]
+                seconds = sum(run["wall"] for run in runs)
+                result["categories"][category] = {
+                    "urls": len(runs),
+                    "seconds": round(seconds, 4),
+                    "seconds_per_url": round(seconds / len(runs), 4),
+                }
+            result["proxy_requests"] = server.proxy_requests
+        result.update(extra)
+        if failed:
+            result["first_failure"] = {
+                "cmd": failed[0]["cmd"],
+                "returncode": failed[0]["returncode"],
+                "timed_out": failed[0]["timed_out"],
+                "stderr_tail": failed[0]["stderr_tail"],
+            }
+        if not self.args.keep:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        return result
+
+
+def scenario_single_large(server, args):
+    scenario = Scenario("single-large", server, args)
+    began = time.perf_counter()
+    scenario.download(scenario.url("large.mp4", args.large_size), args.large_size)
+    return scenario.result(time.perf_counter() - began, file_size=args.large_size)
+
+
+def scenario_many_small(server, args):
+    scenario = Scenario("many-small", server, args)
+    began = time.perf_counter()
+    for index in range(args.small_count):
+        scenario.download(scenario.url(f"clip{index:05d}.mp3", args.small_size), args.small_size)
+    wall = time.perf_counter() - began
+    return scenario.result(wall, file_count=args.small_count, file_size=args.small_size,
+                           seconds_per_file=round(wall / max(args.small_count, 1), 4))
+
+
+def scenario_resume_after_abort(server, args):
+    scenario = Scenario("resume-after-abort", server, args)
+    size = args.large_size
+    path = "/files/resume.mkv"
+    url = scenario.url("resume.mkv", size)
+    server.stall_after(path, size // 2)
+    began = time.perf_counter()
+    out = scenario.download(url, size, abort_event=server.stalled)
+    # Disarm the stall in case the client never sent the GET.
+    server.clear_stall(path)
+    partial = bytes_on_disk(out)
+    served_before = server.bytes_sent
+    scenario.download(url, size, out=out)
+    refetched = server.bytes_sent - served_before
+    completed = scenario.runs[-1]["returncode"] == 0 and bytes_on_disk(out) == size
+    return scenario.result(
+        time.perf_counter() - began,
+        file_size=size,
+        abort_reached_stall=server.stalled.is_set(),
+        partial_bytes_before_resume=partial,
+        bytes_refetched=refetched,
+        resumed=completed and 0 < partial < size and refetched <= size - partial,
+    )
+
+
+def scenario_detection_heavy(server, args):
+    """Mix direct media links with platform URLs that the detector sends to yt-dlp.
+
+    Platform URLs are routed through the bench server as an HTTP(S) proxy,
+    which rejects them at once, so the platform category measures detection
+    and yt-dlp startup cost without touching the network.
+    """
+    scenario = Scenario("detection-heavy", server, args)
+    direct = (("clip{i}.mp4", ""), ("Clip{i}.MP4", ""), ("track{i}.mp3", ""),
+              ("movie{i}.mkv", ""), ("nested/dir/clip{i}.webm", ""), ("clip{i}.mp4", "&ref=bench"))
+    proxy_env = {
+        "HTTP_PROXY": server.base_url, "HTTPS_PROXY": server.base_url,
+        "http_proxy": server.base_url, "https_proxy": server.base_url,
+        "NO_PROXY": "127.0.0.1,localhost", "no_proxy": "127.0.0.1,localhost",
+    }
+    began = time.perf_counter()
+    for index in range(args.detect_count):
+        if index % 2:
+            url = PLATFORM_URLS[index // 2 % len(PLATFORM_URLS)].format(i=index)
+            scenario.download(url, 0, category="platform", env=proxy_env)
+        else:
+            name, query = direct[index // 2 % len(direct)]
+            url = scenario.url(name.format(i=index), args.detect_size, query)
+            scenario.download(url, args.detect_size)
+    wall = time.perf_counter() - began
+    return scenario.result(wall, url_count=args.detect_count,
+                           seconds_per_url=round(wall / max(args.detect_count, 1), 4))
+
+
+RUNNERS = {
+    "single-large": scenario_single_large,
+    "many-small": scenario_many_small,
+    "resume-after-abort": scenario_resume_after_abort,
+    "detection-heavy": scenario_detection_heavy,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PulseDownloader against a local HTTP server.")
+    parser.add_argument("-s", "--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--cmd",
+                        help="Client command template with {url} and {out} placeholders "
+                             "(default: the bundled Pulse_Downloader.py, Windows only)")
+    parser.add_argument("--json", metavar="PATH", help="Write results to PATH instead of stdout")
+    parser.add_argument("--no-ranges", action="store_true", help="Serve files without Range support")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay before each response")
+    parser.add_argument("--bandwidth", type=parse_size, default=0,
+                        help="Per-connection bandwidth cap in bytes/s, e.g. 8M (default: unlimited)")
+    parser.add_argument("--large-size", type=parse_size, default=parse_size("64M"))
+    parser.add_argument("--small-size", type=parse_size, default=parse_size("64K"))
+    parser.add_argument("--small-count", type=int, default=50)
+    parser.add_argument("--detect-size", type=parse_size, default=parse_size("1K"))
+    parser.add_argument("--detect-count", type=int, default=60)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per client process")
+    parser.add_argument("--keep", action="store_true", help="Keep downloaded files for inspection")
+    parser.add_argument("--serve", action="store_true", help="Only run the server until interrupted")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = start_server(port=args.port, ranges=not args.no_ranges,
+                          latency=args.latency, bandwidth=args.bandwidth)
+    if args.serve:
+        print(f"Serving synthetic files at {server.base_url}/files/<name>?size=<bytes>")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+        return 0
+
+    results = []
+    try:
+        for name in args.scenario or SCENARIOS:
+            results.append(RUNNERS[name](server, args))
+    finally:
+        server.shutdown()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "command": args.cmd or build_command(None, "{url}", "{out}"),
+        "unsupported": unsupported_metrics(),
+        "server": {"ranges": not args.no_ranges, "latency": args.latency, "bandwidth": args.bandwidth},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0 if all(result["verified"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())